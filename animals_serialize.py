@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+
+"""
+Serialization core for animals_web_generator: field lookup and card HTML.
+
+Kept in its own, fully annotated module so it can be compiled ahead of time
+with mypyc (``mypyc animals_serialize.py``). The compiled extension is picked
+up automatically in place of this file; without it the pure-Python module is
+used unchanged.
+"""
+
+from __future__ import annotations
+
+import functools
+import html
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+UNKNOWN_SKIN = "Unknown"  # label for animals missing skin_type
+CARD_CACHE_SIZE = 4096  # cards kept by serialize_animal_cached
+
+_UNSAFE = frozenset("&<>\"'")  # characters html.escape(quote=True) rewrites
+
+
+# ---------- data helpers ----------
+def _lower(d: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy of d with lowercased keys. When keys differ only by case, the
+    already-lowercase spelling wins, otherwise the last one seen.
+    """
+    lm = {k.lower(): v for k, v in d.items()}
+    if len(lm) < len(d):  # case collisions: exact lowercase keys take over
+        lm.update((k, v) for k, v in d.items() if k == k.lower())
+    return lm
+
+
+def _lower_only(d: Dict[str, Any], keys: FrozenSet[str]) -> Dict[str, Any]:
+    """The entries _lower(d) would have for the given lowercase keys, and no others."""
+    lm: Dict[str, Any] = {}
+    for k, v in d.items():
+        lk = k.lower()
+        if lk in keys:
+            lm[lk] = v
+    lm.update((k, v) for k, v in d.items() if k in keys)  # exact keys win
+    return lm
+
+
+def lower_keys(d: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy of an animal dict with lowercased keys, including its nested
+    'characteristics' dict. Done once per animal in iter_animals.
+    """
+    lm = _lower(d)
+    ch = lm.get("characteristics")
+    if isinstance(ch, dict):
+        lm["characteristics"] = _lower(ch)
+    return lm
+
+
+def get_ci(d: Dict[str, Any], *keys: str) -> Optional[Any]:
+    """
+    Case-insensitive getter for any of the provided keys. Both d (see
+    lower_keys) and keys must already be lowercase. A null value counts as
+    missing, so lookup falls through to the next key.
+
+    Keys are tried strictly in order, whatever their case in the source:
+    {"Locations": ..., "location": ...} gives "locations". (Before keys
+    were lowercased up front, an exact-case hit on any key beat a
+    case-insensitive hit on an earlier one.)
+    """
+    for k in keys:
+        v = d.get(k)
+        if v is not None:
+            return v
+    return None
+
+
+def characteristics(animal: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return the animal's 'characteristics' dict, or None if absent/invalid."""
+    ch = animal.get("characteristics")
+    return ch if isinstance(ch, dict) else None
+
+
+def get_field(animal: Dict[str, Any], *keys: str) -> Optional[Any]:
+    """
+    Try top-level first, then 'characteristics'. Return None for empty strings.
+    Keys must be lowercase (see get_ci).
+    """
+    return _field(animal, characteristics(animal), *keys)
+
+
+def _field(animal: Dict[str, Any], ch: Optional[Dict[str, Any]], *keys: str) -> Optional[Any]:
+    """get_field() with 'characteristics' already resolved by the caller."""
+    v = get_ci(animal, *keys)
+    if v is None and ch:
+        v = get_ci(ch, *keys)
+    if isinstance(v, str):
+        v = v.strip()
+        if v == "":
+            return None
+    return v
+
+
+def _s(v: Any) -> str:
+    """str(v), skipping the call for values that already are str."""
+    return v if type(v) is str else str(v)
+
+
+def _esc(s: str) -> str:
+    """HTML-escape s; strings without special characters are returned as-is."""
+    return s if _UNSAFE.isdisjoint(s) else html.escape(s)
+
+
+def format_value(value: Any) -> str:
+    """Render lists as comma-separated text and escape HTML."""
+    if type(value) is str:  # by far the most common case
+        return _esc(value)
+    if isinstance(value, (list, tuple)):
+        return _esc(", ".join(x for x in (_s(e).strip() for e in value) if x))
+    return _esc(str(value))
+
+
+def iter_raw_animals(data: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Accepts a list of animals or a dict containing key 'animals'.
+    Non-dict entries are dropped; animals are yielded as-is, without
+    copying (see raw_skin_type). Call again to iterate again.
+    """
+    if isinstance(data, dict):
+        data = data.get("animals")
+    if not isinstance(data, list):
+        return
+    for x in data:
+        # JSON parsers only produce plain dicts, so an exact type check suffices
+        if type(x) is dict:
+            yield x
+
+
+def iter_animals(data: Any) -> Iterator[Dict[str, Any]]:
+    """Like iter_raw_animals, but yields lowercased-key copies (see lower_keys)."""
+    for x in iter_raw_animals(data):
+        yield lower_keys(x)
+
+
+# ---------- skin_type utilities ----------
+_SKIN_KEYS = ("skin_type", "skin type", "skintype")
+_SKIN_KEY_SET = frozenset(_SKIN_KEYS)
+_RAW_SKIN_KEY_SET = _SKIN_KEY_SET | {"characteristics"}
+
+
+def animal_skin_type(animal: Dict[str, Any]) -> str:
+    """Return normalized skin_type or UNKNOWN_SKIN if missing."""
+    return _skin_type(animal, characteristics(animal))
+
+
+def raw_skin_type(animal: Dict[str, Any]) -> str:
+    """
+    animal_skin_type() for an animal straight from the feed (any key case).
+    Only the skin_type keys are lowercased, instead of copying the whole
+    animal with lower_keys.
+    """
+    top = _lower_only(animal, _RAW_SKIN_KEY_SET)
+    ch = characteristics(top)
+    return _skin_type(top, None if ch is None else _lower_only(ch, _SKIN_KEY_SET))
+
+
+def _skin_type(animal: Dict[str, Any], ch: Optional[Dict[str, Any]]) -> str:
+    """animal_skin_type() with 'characteristics' already resolved by the caller."""
+    v = _field(animal, ch, *_SKIN_KEYS)
+    if v is None:
+        return UNKNOWN_SKIN
+    return _s(v).strip()
+
+
+# ---------- serialization ----------
+# Extra facts: (label, candidate keys), rendered after the core facts
+_EXTRAS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("Lifespan", ("lifespan", "lifespan_in_wild", "lifespan_in_captivity")),
+    ("Weight", ("weight", "avg_weight", "weight_range")),
+    ("Length", ("length", "avg_length", "length_range")),
+    ("Height", ("height", "avg_height", "height_range")),
+    ("Top speed", ("top_speed", "speed", "max_speed")),
+    ("Habitat", ("habitat",)),
+    ("Temperament", ("temperament", "behavior")),
+    ("Color(s)", ("color", "colors")),
+    ("Scientific name", ("scientific_name", "latin_name")),
+    ("Family", ("family",)),
+    ("Order", ("order",)),
+    ("Class", ("class", "class_name")),
+    ("Geo range", ("geo_range", "native_region", "range")),
+    ("Conservation status", ("conservation_status", "status")),
+    ("Fun fact", ("fun_fact", "funfact")),
+    ("Description", ("description",)),
+)
+# get_ci expects lowercase keys
+assert all(k == k.lower() for _, keys in _EXTRAS for k in keys)
+
+# Per-label <li> templates, built once; only the value is filled in per animal
+_FACT_TPL: Dict[str, str] = {
+    label: (
+        '        <li class="card__fact"><span class="label">'
+        f'{html.escape(label)}:</span> {{v}}</li>'
+    )
+    for label in ("Diet", "Location", "Type", "Skin type", *(lb for lb, _ in _EXTRAS))
+}
+
+
+def serialize_animal(animal: Dict[str, Any]) -> str:
+    """
+    <li class="cards__item">
+      <div class="card__title">Name</div>
+      <div class="card__text">
+        <ul class="card__facts">
+          <li class="card__fact"><span class="label">Diet:</span> ...</li>
+          ...
+        </ul>
+      </div>
+    </li>
+    """
+    ch = characteristics(animal)
+
+    name = _field(animal, ch, "name")
+    title_html = (
+        f'  <div class="card__title">{_esc(_s(name))}</div>\n'
+        if name
+        else ""
+    )
+
+    # Facts list (core first, then extras)
+    facts: List[Tuple[str, Any]] = []
+
+    # Core
+    diet = _field(animal, ch, "diet")
+    if diet:
+        facts.append(("Diet", diet))
+
+    locs = _field(animal, ch, "locations", "location")
+    first_loc = None
+    if isinstance(locs, list) and locs:
+        first_loc = _s(locs[0]).strip()
+    elif isinstance(locs, str) and locs.strip():
+        first_loc = locs.strip()
+    if first_loc:
+        facts.append(("Location", first_loc))
+
+    typ = _field(animal, ch, "type")
+    if typ:
+        facts.append(("Type", typ))
+
+    skin = _skin_type(animal, ch)
+    if skin != UNKNOWN_SKIN:
+        facts.append(("Skin type", skin))
+    else:
+        # Optional: zeige Unknown explizit
+        facts.append(("Skin type", UNKNOWN_SKIN))
+
+    # Extras
+    for label, keys in _EXTRAS:
+        v = _field(animal, ch, *keys)
+        if v is not None:
+            facts.append((label, v))
+
+    if not (title_html or facts):
+        return ""
+
+    facts_html = "\n".join(
+        _FACT_TPL[label].format(v=format_value(val)) for label, val in facts
+    )
+
+    parts: List[str] = ['  <li class="cards__item">\n']
+    if title_html:
+        parts.append(title_html)
+    parts.append('  <div class="card__text">\n')
+    parts.append('    <ul class="card__facts">\n')
+    parts.append(facts_html)
+    parts.append("\n")
+    parts.append("    </ul>\n")
+    parts.append("  </div>\n")
+    parts.append("  </li>\n")
+    return "".join(parts)
+
+
+# ---------- memoized serialization ----------
+def _freeze(v: Any) -> Any:
+    """
+    Hashable, content-equal form of a JSON value. Scalars are tagged with
+    their type so that e.g. 1, 1.0 and True (which render differently)
+    do not collide.
+    """
+    if type(v) is str:
+        return v
+    if type(v) is dict:
+        return frozenset((k, _freeze(x)) for k, x in v.items())
+    if type(v) is list or type(v) is tuple:
+        return tuple(_freeze(x) for x in v)
+    return (type(v), v)
+
+
+class _Frozen:
+    """Animal dict paired with its content key, so it can key the card cache."""
+
+    __slots__ = ("animal", "key")
+
+    def __init__(self, animal: Dict[str, Any]) -> None:
+        self.animal = animal
+        self.key = _freeze(animal)
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Frozen) and self.key == other.key
+
+
+@functools.lru_cache(maxsize=CARD_CACHE_SIZE)
+def _serialize_frozen(frozen: _Frozen) -> str:
+    return serialize_animal(frozen.animal)
+
+
+def serialize_animal_cached(animal: Dict[str, Any]) -> str:
+    """serialize_animal(), memoized on content for feeds with duplicate entries."""
+    return _serialize_frozen(_Frozen(animal))
@@ -9,93 +9,188 @@ New:
 - Ask the user to choose a skin_type (by number or name).
 - Render the website only for animals matching the chosen skin_type.
 - Animals without skin_type are grouped under "Unknown".
+- Optional --jobs N serializes large feeds in N worker processes.
+- Optional --dedupe renders duplicate animal entries only once.
 """
 
 from __future__ import annotations
 
-import html
 import json
+import re
 import sys
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
-
-PLACEHOLDER = "__REPLACE_ANIMALS_INFO__"
-UNKNOWN_SKIN = "Unknown"  # label for animals missing skin_type
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from animals_serialize import (
+    UNKNOWN_SKIN,
+    iter_raw_animals,
+    lower_keys,
+    raw_skin_type,
+    serialize_animal,
+    serialize_animal_cached,
+)
+
+_loads: Callable[[bytes], Any]
+_LOADS_ERRORS: Tuple[type[Exception], ...]
+try:  # optional: orjson parses large JSON feeds considerably faster
+    import orjson
+
+    _loads = orjson.loads
+    _LOADS_ERRORS = (orjson.JSONDecodeError,)
+except ImportError:  # pragma: no cover - fallback to stdlib (accepts UTF-8 bytes)
+    _loads = json.loads
+    _LOADS_ERRORS = ()
+
+# 19+ digit runs may be integers beyond 64 bits, which orjson turns into floats
+_LONG_INT_RE = re.compile(rb"\d{19}")
+
+CARDS_NAME = "ANIMALS_INFO"  # placeholder name the cards are streamed into
+PLACEHOLDER = f"__REPLACE_{CARDS_NAME}__"
+# Matches every __REPLACE_<NAME>__ placeholder, so one scan finds them all.
+# NAME is underscore-separated words, so a match never runs past a "__".
+_PH_RE = re.compile(rb"__REPLACE_([A-Z]+(?:_[A-Z]+)*)__")
+_CARDS_KEY = CARDS_NAME.encode("utf-8")
+_PLACEHOLDER_B = PLACEHOLDER.encode("utf-8")
+PARALLEL_MIN_ANIMALS = 1000  # below this, worker start-up outweighs the gain
+WRITE_BUFFER_SIZE = 1 << 20  # fixed output buffer; cards are small, writes are many
 
 
 # ---------- IO helpers ----------
-def read_text(path: str | Path) -> str:
-    return Path(path).read_text(encoding="utf-8")
+def read_bytes(path: str | Path) -> bytes:
+    return Path(path).read_bytes()
 
 
-def write_text(path: str | Path, content: str) -> None:
-    Path(path).write_text(content, encoding="utf-8")
+def read_template(path: str | Path) -> bytes:
+    """
+    Read the template as UTF-8 bytes with CRLF/CR line endings turned into
+    LF, like text-mode reading did, so the page never mixes line endings.
+    """
+    return read_bytes(path).replace(b"\r\n", b"\n").replace(b"\r", b"\n")
 
 
-# ---------- data helpers ----------
-def get_ci(d: Dict[str, Any], *keys: str) -> Optional[Any]:
-    """Case-insensitive getter for any of the provided keys."""
-    for k in keys:
-        if k in d:
-            return d[k]
-    lower_map = {k.lower(): v for k, v in d.items()}
-    for k in keys:
-        v = lower_map.get(k.lower())
-        if v is not None:
-            return v
-    return None
+def read_json(path: str | Path) -> Any:
+    """
+    Parse a JSON file (orjson if installed, stdlib json otherwise).
+    Input that orjson would parse differently goes through stdlib json, so
+    the result is always what json.loads gives: files with 19+ digit numbers
+    (orjson turns integers beyond 64 bits into floats), and files orjson
+    rejects but json accepts (NaN, Infinity, 1e400, lone surrogates).
+    """
+    raw = read_bytes(path)
+    if _LONG_INT_RE.search(raw):
+        return json.loads(raw)
+    try:
+        return _loads(raw)
+    except _LOADS_ERRORS:
+        return json.loads(raw)
+
+
+def write_page(
+    path: str | Path,
+    template: bytes,
+    animals: Iterable[Dict[str, Any]],
+    jobs: int = 1,
+    dedupe: bool = False,
+) -> int:
+    """
+    Write the UTF-8 template with animal cards streamed in at PLACEHOLDER,
+    without building the full page in memory first. The template is never
+    decoded; each card is encoded exactly once. Placeholders without a
+    filler are left untouched. Return the number of animals, whether or
+    not the template has a cards placeholder.
+    """
+    n_placeholders = template.count(_PLACEHOLDER_B)
+    if n_placeholders > 1:
+        animals = tuple(animals)  # a stream can only be consumed once
+    count = 0
+
+    def cards() -> Iterator[bytes]:
+        nonlocal count
+        count = 0
+        for card in iter_cards(animals, jobs, dedupe):
+            count += 1
+            yield card.encode("utf-8")
+
+    with open(path, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+        f.writelines(fill_template(template, {_CARDS_KEY: cards}))
+    if not n_placeholders:
+        count = sum(1 for _ in animals)
+    return count
+
+
+def fill_template(
+    template: bytes, fillers: Dict[bytes, Callable[[], Iterable[bytes]]]
+) -> Iterator[bytes]:
+    """
+    Yield the template in chunks, with each __REPLACE_<NAME>__ placeholder
+    replaced by the chunks of fillers[NAME](). Unknown placeholders are
+    left untouched.
+
+    >>> def fill(t):
+    ...     return b"".join(fill_template(t, {b"ANIMALS_INFO": lambda: [b"<li/>"]}))
+    >>> fill(b"A__REPLACE_ANIMALS_INFO__B__REPLACE_ANIMALS_INFO__C")
+    b'A<li/>B<li/>C'
+    >>> fill(b"__REPLACE_ANIMALS_INFO___")
+    b'<li/>_'
+    >>> fill(b"__REPLACE_ANIMALS_INFO__FOO__ __REPLACE_TITLE__")
+    b'<li/>FOO__ __REPLACE_TITLE__'
+    >>> fill(b"__REPLACE_X__REPLACE_ANIMALS_INFO__")
+    b'__REPLACE_X<li/>'
+    """
+    pos = 0
+    m = _PH_RE.search(template)
+    while m:
+        fill = fillers.get(m.group(1))
+        if fill is None:
+            # keep the unknown placeholder as text, but rescan its closing
+            # "__": it may open the next placeholder
+            m = _PH_RE.search(template, m.end() - 2)
+            continue
+        yield template[pos:m.start()]
+        yield from fill()
+        pos = m.end()
+        m = _PH_RE.search(template, pos)
+    yield template[pos:]
 
 
-def get_field(animal: Dict[str, Any], *keys: str) -> Optional[Any]:
+# ---------- serialization ----------
+def iter_cards(
+    animals: Iterable[Dict[str, Any]], jobs: int = 1, dedupe: bool = False
+) -> Iterator[str]:
     """
-    Try top-level first, then 'characteristics'. Return None for empty strings.
+    Yield serialized cards in input order. With jobs > 1 and a large enough
+    feed, serialization is spread over worker processes (the work is pure
+    Python, so threads would not help under the GIL). With dedupe, cards are
+    memoized by content (serialize_animal_cached); that only pays off for
+    feeds with many duplicates, as hashing each animal costs about as much
+    as rendering it.
     """
-    v = get_ci(animal, *keys)
-    if v is None:
-        ch = get_ci(animal, "characteristics")
-        if isinstance(ch, dict):
-            v = get_ci(ch, *keys)
-    if isinstance(v, str):
-        v = v.strip()
-        if v == "":
-            return None
-    return v
-
-
-def format_value(value: Any) -> str:
-    """Render lists as comma-separated text and escape HTML."""
-    if isinstance(value, (list, tuple)):
-        value = ", ".join(str(x).strip() for x in value if str(x).strip())
-    return html.escape(str(value))
-
-
-def iter_animals(data: Any) -> List[Dict[str, Any]]:
-    """Accepts a list of animals or a dict containing key 'animals'."""
-    if isinstance(data, list):
-        return [x for x in data if isinstance(x, dict)]
-    if isinstance(data, dict) and isinstance(data.get("animals"), list):
-        return [x for x in data["animals"] if isinstance(x, dict)]
-    return []
+    serialize = serialize_animal_cached if dedupe else serialize_animal
+    if jobs > 1:
+        # the pool submits every item up front anyway, so collecting is free
+        batch = list(animals)
+        if len(batch) > PARALLEL_MIN_ANIMALS:
+            chunksize = max(1, len(batch) // (jobs * 4))
+            with ProcessPoolExecutor(jobs) as ex:
+                yield from ex.map(serialize, batch, chunksize=chunksize)
+            return
+        animals = batch
+    for a in animals:
+        yield serialize(a)
 
 
 # ---------- skin_type utilities ----------
-def animal_skin_type(animal: Dict[str, Any]) -> str:
-    """Return normalized skin_type or UNKNOWN_SKIN if missing."""
-    v = get_field(animal, "skin_type", "skin type", "skintype")
-    if v is None:
-        return UNKNOWN_SKIN
-    return str(v).strip()
-
-
 def collect_skin_types(animals: Iterable[Dict[str, Any]]) -> List[Tuple[str, int]]:
     """
     Return a list of (skin_type, count) sorted alphabetically (case-insensitive).
-    Includes UNKNOWN_SKIN if any animal lacks skin_type.
+    Includes UNKNOWN_SKIN if any animal lacks skin_type. Animals may come
+    straight from the feed; they are not copied.
     """
     counter: Counter[str] = Counter()
     for a in animals:
-        counter[animal_skin_type(a)] += 1
+        counter[raw_skin_type(a)] += 1
     # sort case-insensitively, but keep Unknown at the end for better UX
     items = sorted(
         ((k, n) for k, n in counter.items() if k != UNKNOWN_SKIN),
@@ -132,149 +227,81 @@ def prompt_skin_choice(skin_counts: List[Tuple[str, int]]) -> str:
     return "ALL"
 
 
-def filter_by_skin(animals: List[Dict[str, Any]], chosen: str) -> List[Dict[str, Any]]:
-    """Filter animals by chosen skin_type. 'ALL' shows all animals."""
+def filter_by_skin(animals: Iterable[Dict[str, Any]], chosen: str) -> Iterable[Dict[str, Any]]:
+    """
+    Lazily filter animals by chosen skin_type. 'ALL' shows all animals.
+    Animals may come straight from the feed; they are not copied.
+    """
     if chosen == "ALL":
         return animals
     if chosen == UNKNOWN_SKIN:
-        return [a for a in animals if animal_skin_type(a) == UNKNOWN_SKIN]
-    return [a for a in animals if animal_skin_type(a).lower() == chosen.lower()]
+        return (a for a in animals if raw_skin_type(a) == UNKNOWN_SKIN)
+    chosen_l = chosen.lower()
+    return (a for a in animals if raw_skin_type(a).lower() == chosen_l)
 
 
-# ---------- serialization ----------
-def serialize_animal(animal: Dict[str, Any]) -> str:
+# ---------- main ----------
+def parse_args(argv: List[str]) -> Tuple[List[str], int, bool]:
     """
-    <li class="cards__item">
-      <div class="card__title">Name</div>
-      <div class="card__text">
-        <ul class="card__facts">
-          <li class="card__fact"><span class="label">Diet:</span> ...</li>
-          ...
-        </ul>
-      </div>
-    </li>
+    Split '--jobs N' / '-j N' / '--jobs=N' and '--dedupe' off argv.
+    Return (positional args, jobs, dedupe); jobs defaults to 1.
     """
-    name = get_field(animal, "name")
-    title_html = (
-        f'  <div class="card__title">{html.escape(str(name))}</div>\n'
-        if name
-        else ""
-    )
-
-    # Facts list (core first, then extras)
-    facts: List[Tuple[str, Any]] = []
-
-    # Core
-    diet = get_field(animal, "diet")
-    if diet:
-        facts.append(("Diet", diet))
-
-    locs = get_field(animal, "locations", "location")
-    first_loc = None
-    if isinstance(locs, list) and locs:
-        first_loc = str(locs[0]).strip()
-    elif isinstance(locs, str) and locs.strip():
-        first_loc = locs.strip()
-    if first_loc:
-        facts.append(("Location", first_loc))
-
-    typ = get_field(animal, "type")
-    if typ:
-        facts.append(("Type", typ))
-
-    skin = animal_skin_type(animal)
-    if skin != UNKNOWN_SKIN:
-        facts.append(("Skin type", skin))
-    else:
-        # Optional: zeige Unknown explizit
-        facts.append(("Skin type", UNKNOWN_SKIN))
-
-    # Extras
-    extras = [
-        ("Lifespan", ("lifespan", "lifespan_in_wild", "lifespan_in_captivity")),
-        ("Weight", ("weight", "avg_weight", "weight_range")),
-        ("Length", ("length", "avg_length", "length_range")),
-        ("Height", ("height", "avg_height", "height_range")),
-        ("Top speed", ("top_speed", "speed", "max_speed")),
-        ("Habitat", ("habitat",)),
-        ("Temperament", ("temperament", "behavior")),
-        ("Color(s)", ("color", "colors")),
-        ("Scientific name", ("scientific_name", "latin_name")),
-        ("Family", ("family",)),
-        ("Order", ("order",)),
-        ("Class", ("class", "class_name")),
-        ("Geo range", ("geo_range", "native_region", "range")),
-        ("Conservation status", ("conservation_status", "status")),
-        ("Fun fact", ("fun_fact", "funfact")),
-        ("Description", ("description",)),
-    ]
-    for label, keys in extras:
-        v = get_field(animal, *keys)
-        if v is not None:
-            facts.append((label, v))
-
-    if not (title_html or facts):
-        return ""
-
-    facts_html = "\n".join(
-        f'        <li class="card__fact"><span class="label">{html.escape(label)}:</span> {format_value(val)}</li>'
-        for label, val in facts
-    )
-
-    item = '  <li class="cards__item">\n'
-    if title_html:
-        item += title_html
-    item += '  <div class="card__text">\n'
-    item += '    <ul class="card__facts">\n'
-    item += facts_html + "\n"
-    item += "    </ul>\n"
-    item += "  </div>\n"
-    item += "  </li>\n"
-    return item
-
+    args: List[str] = []
+    jobs = 1
+    dedupe = False
+    it = iter(argv)
+    for arg in it:
+        if arg in ("--jobs", "-j"):
+            jobs = int(next(it, ""))
+        elif arg.startswith("--jobs="):
+            jobs = int(arg.split("=", 1)[1])
+        elif arg == "--dedupe":
+            dedupe = True
+        else:
+            args.append(arg)
+    if jobs < 1:
+        raise ValueError(f"jobs must be >= 1, got {jobs}")
+    return args, jobs, dedupe
 
-def build_cards(animals: Iterable[Dict[str, Any]]) -> str:
-    return "".join(serialize_animal(a) for a in animals if isinstance(a, dict))
 
-
-# ---------- main ----------
 def main() -> None:
-    json_path = sys.argv[1] if len(sys.argv) > 1 else "animals_data.json"
-    template_path = sys.argv[2] if len(sys.argv) > 2 else "animals_template.html"
-    out_path = sys.argv[3] if len(sys.argv) > 3 else "animals.html"
+    try:
+        args, jobs, dedupe = parse_args(sys.argv[1:])
+    except ValueError as e:
+        print(f"❌ Invalid --jobs value: {e}")
+        sys.exit(1)
+
+    json_path = args[0] if len(args) > 0 else "animals_data.json"
+    template_path = args[1] if len(args) > 1 else "animals_template.html"
+    out_path = args[2] if len(args) > 2 else "animals.html"
 
     # Read inputs
     try:
-        template_html = read_text(template_path)
-        with open(json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        template = read_template(template_path)
+        data = read_json(json_path)
     except Exception as e:
         print(f"❌ Read error: {e}")
         sys.exit(1)
 
-    animals = iter_animals(data)
-
     # Show available skin types and ask user
-    skin_counts = collect_skin_types(animals)
+    skin_counts = collect_skin_types(iter_raw_animals(data))
     chosen_skin = prompt_skin_choice(skin_counts)
 
-    # Filter animals
-    filtered = filter_by_skin(animals, chosen_skin)
-    if not filtered:
+    # Every listed skin_type has animals, so only an empty feed has none
+    if not skin_counts:
         print(f"No animals found for skin_type '{chosen_skin}'. Exiting.")
         sys.exit(0)
 
-    # Build and write HTML
-    cards_html = build_cards(filtered)
-    final_html = template_html.replace(PLACEHOLDER, cards_html)
-
+    # Filter and write HTML in one streaming pass over the feed; only the
+    # selected animals are copied (lower_keys), one at a time
+    selected = map(lower_keys, filter_by_skin(iter_raw_animals(data), chosen_skin))
     try:
-        write_text(out_path, final_html)
+        count = write_page(out_path, template, selected, jobs, dedupe)
     except Exception as e:
         print(f"❌ Write error: {e}")
         sys.exit(1)
 
-    print(f"✅ Wrote {out_path} with {len(filtered)} animals (skin_type = {chosen_skin}).")
+    print(f"✅ Wrote {out_path} with {count} animals (skin_type = {chosen_skin}).")
 
 
 if __name__ == "__main__":